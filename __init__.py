@@ -3,8 +3,9 @@
 Google Maps scraping module
 """
 from .gmaps_scraper import GoogleMapsScraper
+from .places_api import PlacesAPIScraper
 
-__all__ = ['GoogleMapsScraper']
+__all__ = ['GoogleMapsScraper', 'PlacesAPIScraper']
 
 # enrichment/__init__.py
 """
@@ -49,5 +50,15 @@ __all__ = [
 Utility functions and helpers
 """
 from .export import ExportManager
+from .rate_limiter import RateLimiter, KeyedRateLimiter
+from .cache import ResultCache, cache_key
 
-__all__ = ['ExportManager']
\ No newline at end of file
+__all__ = ['ExportManager', 'RateLimiter', 'KeyedRateLimiter', 'ResultCache', 'cache_key']
+
+# storage/__init__.py
+"""
+Scrape session storage backends
+"""
+from .lead_store import LeadStore, MemoryLeadStore, RedisLeadStore, create_lead_store
+
+__all__ = ['LeadStore', 'MemoryLeadStore', 'RedisLeadStore', 'create_lead_store']
\ No newline at end of file
@@ -1,7 +1,13 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sse_starlette.sse import EventSourceResponse
+from typing import AsyncIterator, List, Optional, Tuple
 import asyncio
+import os
+import orjson
+import uuid
+from urllib.parse import quote
 from models.schemas import (
     ScrapeRequest, 
     ScrapeResponse, 
@@ -11,13 +17,17 @@ from models.schemas import (
     Lead
 )
 from scraper.gmaps_scraper import GoogleMapsScraper
+from scraper.places_api import PlacesAPIScraper
 from enrichment.hunter_api import HunterEnrichment
 from utils.export import ExportManager
+from utils.cache import ResultCache, cache_key
+from storage.lead_store import create_lead_store
 
 app = FastAPI(
     title="Lovable Lead Gen API",
     description="A powerful lead generation API with Google Maps scraping and email enrichment",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -30,33 +40,120 @@ app.add_middleware(
 )
 
 # Global instances
-scraper = GoogleMapsScraper()
-enricher = HunterEnrichment()
+# Prefer the Places API when a key is configured; fall back to browser scraping
+scraper = PlacesAPIScraper() if os.getenv("GOOGLE_PLACES_API_KEY") else GoogleMapsScraper()
 export_manager = ExportManager()
 
-# In-memory storage for demo (replace with database in production)
-leads_storage = {}
+# Persistent cache so repeated scrapes and email lookups skip the upstream calls
+result_cache = ResultCache(
+    directory=os.getenv("RESULT_CACHE_DIR", ".cache"),
+    ttl=int(os.getenv("RESULT_CACHE_TTL", 3600))
+)
+enricher = HunterEnrichment(cache=result_cache)
+
+# Scrape session storage: Redis when REDIS_URL is set (shared across workers),
+# otherwise a bounded in-memory LRU/TTL cache
+store = create_lead_store()
+
+# Characters that could break out of the quoted Content-Disposition filename
+_UNSAFE_FILENAME_CHARS = str.maketrans('', '', '"\\\r\n')
+
+@app.on_event("startup")
+async def startup():
+    """
+    Start the shared scraper (browser or HTTP client) once so every scrape reuses it
+    """
+    await scraper.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Close the shared scraper, enrichment and storage connections
+    """
+    await scraper.close()
+    await enricher.close()
+    await store.close()
+    result_cache.close()
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to Lovable Lead Gen API", "status": "active"}
 
+def _content_disposition(filename: str) -> str:
+    """
+    Build an attachment Content-Disposition header the way Starlette's FileResponse does
+    """
+    quoted = quote(filename)
+    if quoted == filename:
+        return f'attachment; filename="{filename}"'
+    
+    # Headers are latin-1, so non-ASCII names go in the RFC 5987 filename* parameter
+    # with an ASCII-only filename fallback for old clients
+    fallback = filename.encode('ascii', 'ignore').decode('ascii')
+    if not fallback.rsplit('.', 1)[0].strip():
+        fallback = "leads.csv"
+    return f"attachment; filename=\"{fallback}\"; filename*=utf-8''{quoted}"
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Weak comparison of If-None-Match against an ETag, as RFC 9110 requires for GET
+    """
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def _sse_json(payload: dict) -> str:
+    """
+    Encode an SSE event payload with orjson
+    """
+    return orjson.dumps(payload).decode('utf-8')
+
+def _in_rank_order(ranked: List[Tuple[int, Lead]]) -> List[Lead]:
+    """
+    Put (rank, lead) pairs collected in completion order back into ranking order
+    """
+    return [lead for _, lead in sorted(ranked, key=lambda pair: pair[0])]
+
+async def _iter_scrape(request: ScrapeRequest) -> AsyncIterator[Tuple[int, Lead]]:
+    """
+    Yield (rank, lead) pairs as leads arrive, serving repeat queries from the result cache
+    """
+    key = cache_key(
+        "scrape",
+        request.query.strip().lower(),
+        request.location.strip().lower(),
+        request.max_results
+    )
+    # The result cache is SQLite on disk, keep its I/O off the event loop
+    cached_leads = await asyncio.to_thread(result_cache.get_leads, key)
+    if cached_leads is not None:
+        for rank, lead in enumerate(cached_leads):
+            yield rank, lead
+        return
+    
+    ranked = []
+    async for rank, lead in scraper.iter_scrape(
+        query=request.query,
+        location=request.location,
+        max_results=request.max_results
+    ):
+        ranked.append((rank, lead))
+        yield rank, lead
+    
+    # Cache in ranking order so repeat queries come back the way Google listed them
+    await asyncio.to_thread(result_cache.set_leads, key, _in_rank_order(ranked))
+
 @app.post("/scrape", response_model=ScrapeResponse)
 async def scrape_leads(request: ScrapeRequest):
     """
     Scrape leads from Google Maps based on search query and location
     """
     try:
-        leads = await scraper.scrape_businesses(
-            query=request.query,
-            location=request.location,
-            max_results=request.max_results
-        )
+        leads = _in_rank_order([pair async for pair in _iter_scrape(request)])
         
         # Store leads with a unique ID
-        import uuid
         scrape_id = str(uuid.uuid4())
-        leads_storage[scrape_id] = leads
+        await store.put(scrape_id, leads)
         
         return ScrapeResponse(
             scrape_id=scrape_id,
@@ -68,6 +165,36 @@ async def scrape_leads(request: ScrapeRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scraping failed: {str(e)}")
 
+@app.post("/scrape/stream")
+async def scrape_leads_stream(request: ScrapeRequest):
+    """
+    Scrape leads, streaming each one as a Server-Sent Event as soon as it's ready
+    """
+    scrape_id = str(uuid.uuid4())
+    
+    async def events():
+        ranked = []
+        try:
+            # Events go out in completion order; index is the lead's ranking position
+            async for rank, lead in _iter_scrape(request):
+                yield {
+                    "event": "lead",
+                    "data": _sse_json({"index": rank, "lead": lead.model_dump()})
+                }
+                ranked.append((rank, lead))
+        except Exception as e:
+            yield {"event": "error", "data": _sse_json({"detail": f"Scraping failed: {str(e)}"})}
+            return
+        
+        leads = _in_rank_order(ranked)
+        await store.put(scrape_id, leads)
+        yield {
+            "event": "complete",
+            "data": _sse_json({"scrape_id": scrape_id, "total_found": len(leads), "status": "success"})
+        }
+    
+    return EventSourceResponse(events())
+
 @app.post("/enrich", response_model=EnrichmentResponse)
 async def enrich_leads(request: EnrichmentRequest):
     """
@@ -75,27 +202,60 @@ async def enrich_leads(request: EnrichmentRequest):
     """
     try:
         # Get leads from storage
-        if request.scrape_id not in leads_storage:
+        leads = await store.get(request.scrape_id)
+        if leads is None:
             raise HTTPException(status_code=404, detail="Scrape ID not found")
         
-        leads = leads_storage[request.scrape_id]
-        
         # Enrich with emails
         enriched_leads = await enricher.enrich_leads(leads, request.hunter_api_key)
         
         # Update storage
-        leads_storage[request.scrape_id] = enriched_leads
+        await store.put(request.scrape_id, enriched_leads)
         
         return EnrichmentResponse(
             scrape_id=request.scrape_id,
             enriched_leads=enriched_leads,
-            enrichment_count=len([lead for lead in enriched_leads if lead.email]),
+            enrichment_count=sum(1 for lead in enriched_leads if lead.email),
             status="success"
         )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Enrichment failed: {str(e)}")
 
+@app.post("/enrich/stream")
+async def enrich_leads_stream(request: EnrichmentRequest):
+    """
+    Enrich leads, streaming each one as a Server-Sent Event as its lookup finishes
+    """
+    leads = await store.get(request.scrape_id)
+    if leads is None:
+        raise HTTPException(status_code=404, detail="Scrape ID not found")
+    
+    async def events():
+        enriched_leads = list(leads)
+        try:
+            async for index, lead in enricher.iter_enrich(leads, request.hunter_api_key):
+                enriched_leads[index] = lead
+                yield {
+                    "event": "lead",
+                    "data": _sse_json({"index": index, "total": len(leads), "lead": lead.model_dump()})
+                }
+        except Exception as e:
+            yield {"event": "error", "data": _sse_json({"detail": f"Enrichment failed: {str(e)}"})}
+            return
+        
+        await store.put(request.scrape_id, enriched_leads)
+        yield {
+            "event": "complete",
+            "data": _sse_json({
+                "scrape_id": request.scrape_id,
+                "enrichment_count": sum(1 for lead in enriched_leads if lead.email),
+                "status": "success"
+            })
+        }
+    
+    return EventSourceResponse(events())
+
 @app.post("/export")
 async def export_leads(request: ExportRequest):
     """
@@ -103,20 +263,28 @@ async def export_leads(request: ExportRequest):
     """
     try:
         # Get leads from storage
-        if request.scrape_id not in leads_storage:
+        leads = await store.get(request.scrape_id)
+        if leads is None:
             raise HTTPException(status_code=404, detail="Scrape ID not found")
         
-        leads = leads_storage[request.scrape_id]
-        
         if request.format == "csv":
-            file_path = export_manager.export_to_csv(leads, request.filename)
-            return {"message": f"Exported to {file_path}", "file_path": file_path}
+            filename = (request.filename or "").translate(_UNSAFE_FILENAME_CHARS) or "leads.csv"
+            if not filename.endswith('.csv'):
+                filename += '.csv'
+            
+            # Stream rows to the client instead of building the file up front
+            return StreamingResponse(
+                export_manager.iter_csv(leads),
+                media_type="text/csv",
+                headers={"Content-Disposition": _content_disposition(filename)}
+            )
         
         elif request.format == "sheets":
             if not request.sheets_url:
                 raise HTTPException(status_code=400, detail="Google Sheets URL required")
             
-            success = export_manager.export_to_sheets(leads, request.sheets_url)
+            # Sheets export does blocking I/O, keep it off the event loop
+            success = await asyncio.to_thread(export_manager.export_to_sheets, leads, request.sheets_url)
             if success:
                 return {"message": "Successfully exported to Google Sheets"}
             else:
@@ -129,17 +297,30 @@ async def export_leads(request: ExportRequest):
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
 @app.get("/leads/{scrape_id}")
-async def get_leads(scrape_id: str):
+async def get_leads(scrape_id: str, request: Request, response: Response):
     """
     Get stored leads by scrape ID
     """
-    if scrape_id not in leads_storage:
+    entry = await store.get_with_etag(scrape_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Scrape ID not found")
     
+    leads, version = entry
+    etag = f'"{version}"'
+    
+    # A 304 carries the same caching headers the 200 would
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=5"}
+    
+    # Let polling clients skip the body when nothing changed since their last fetch
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
     return {
         "scrape_id": scrape_id,
-        "leads": leads_storage[scrape_id],
-        "total": len(leads_storage[scrape_id])
+        "leads": leads,
+        "total": len(leads)
     }
 
 @app.delete("/leads/{scrape_id}")
@@ -147,17 +328,17 @@ async def delete_leads(scrape_id: str):
     """
     Delete stored leads by scrape ID
     """
-    if scrape_id not in leads_storage:
+    if not await store.delete(scrape_id):
         raise HTTPException(status_code=404, detail="Scrape ID not found")
     
-    del leads_storage[scrape_id]
     return {"message": "Leads deleted successfully"}
 
 @app.get("/health")
-async def health_check():
+async def health_check(response: Response):
     """
     Health check endpoint
     """
+    response.headers["Cache-Control"] = "max-age=10"
     return {"status": "healthy", "service": "lovable-leadgen"}
 
 if __name__ == "__main__":
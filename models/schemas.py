@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -18,10 +18,8 @@ class Lead(BaseModel):
     place_id: Optional[str] = None
     coordinates: Optional[Dict[str, float]] = None  # {"lat": 0.0, "lng": 0.0}
     
-    class Config:
-        json_encoders = {
-            # Custom encoders if needed
-        }
+    # Leads are immutable once scraped; enrichment produces updated copies
+    model_config = ConfigDict(extra='forbid', frozen=True)
 
 class ScrapeRequest(BaseModel):
     """
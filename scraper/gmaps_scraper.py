@@ -1,223 +1,331 @@
 import asyncio
 import re
-from typing import List, Dict, Optional
-from playwright.async_api import async_playwright, Page, Browser
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright, Browser, Page, Playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from models.schemas import Lead
+from utils.rate_limiter import KeyedRateLimiter
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Place hrefs look like /maps/place/<name slug>/data=!4m7!3m6!1s0x..:0x..!...!19sChIJ...
+# The slug is just the business name, so identity comes from the data= tokens:
+# !19s carries the Places API place ID and !1s the Maps feature ID
+_PLACE_ID_RE = re.compile(r'!19s(ChIJ[^!?&/]+)')
+_FEATURE_ID_RE = re.compile(r'!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)')
+
+# Extracts every listing in the results panel in a single round trip;
+# rating/review parsing happens in-page instead of per field over CDP
+_EXTRACT_LISTINGS_JS = """
+() => Array.from(document.querySelectorAll('[data-result-index]')).map(e => {
+    const text = (selector) => e.querySelector(selector)?.textContent?.trim() || null;
+    const rating = text('[data-value="Rating"]')?.match(/\\d+\\.?\\d*/);
+    const reviews = text('[data-value="Reviews"]')?.replace(/,/g, '').match(/\\d+/);
+    return {
+        name: text('[data-value="Business name"]'),
+        address: text('[data-value="Address"]'),
+        rating: rating ? parseFloat(rating[0]) : null,
+        reviews_count: reviews ? parseInt(reviews[0], 10) : null,
+        category: text('[data-value="Category"]'),
+        google_maps_url: e.querySelector('a[href*="/maps/place/"]')?.href || null
+    };
+})
+"""
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
 class GoogleMapsScraper:
     """
     Google Maps scraper using Playwright for dynamic content
     """
     
-    def __init__(self):
+    def __init__(self, concurrency: int = 5, requests_per_second: float = 2.0, detail_chunk_size: int = 20):
+        self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
+        self.concurrency = concurrency
+        self.detail_chunk_size = detail_chunk_size
+        self.sem: Optional[asyncio.Semaphore] = None
+        
+        # One request budget per host, shared by all concurrent pages
+        self.rate_limiter = KeyedRateLimiter(requests_per_second)
     
     async def _init_browser(self):
-        """Initialize browser instance"""
+        """Initialize browser instance (reused across scrapes)"""
         if not self.browser:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(
                 headless=True,
                 args=['--no-sandbox', '--disable-setuid-sandbox']
             )
-            self.page = await self.browser.new_page()
             
-            # Set user agent to avoid detection
-            await self.page.set_user_agent(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            )
+            # Bound the number of detail pages open at once
+            self.sem = asyncio.Semaphore(self.concurrency)
     
     async def _close_browser(self):
         """Close browser instance"""
         if self.browser:
             await self.browser.close()
             self.browser = None
-            self.page = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+    
+    async def start(self):
+        """Launch the shared browser"""
+        await self._init_browser()
+    
+    async def close(self):
+        """Shut down the shared browser"""
+        await self._close_browser()
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
     
     async def scrape_businesses(self, query: str, location: str, max_results: int = 50) -> List[Lead]:
         """
-        Scrape businesses from Google Maps
+        Scrape businesses from Google Maps, returned in Google's ranking order
+        """
+        ranked = [pair async for pair in self.iter_scrape(query, location, max_results)]
+        ranked.sort(key=lambda pair: pair[0])
+        return [lead for _, lead in ranked]
+    
+    async def iter_scrape(self, query: str, location: str, max_results: int = 50) -> AsyncIterator[Tuple[int, Lead]]:
+        """
+        Scrape businesses from Google Maps, yielding (rank, lead) pairs as soon as details arrive
         """
         await self._init_browser()
         
+        # Each scrape gets its own context so concurrent requests don't share a page
+        context = await self.browser.new_context(user_agent=USER_AGENT)
+        
         try:
-            # Construct search URL
-            search_url = f"https://www.google.com/maps/search/{query}+{location}"
             logger.info(f"Starting scrape for: {query} in {location}")
             
-            # Navigate to Google Maps
-            await self.page.goto(search_url, wait_until='networkidle')
-            await asyncio.sleep(2)
+            # Collect listing data and place URLs without leaving the results page
+            page = await context.new_page()
+            listings = await self._collect_place_urls(page, query, location, max_results)
             
-            # Wait for results to load
-            await self.page.wait_for_selector('[data-value="Search results"]', timeout=10000)
+            # The detail pass never goes back to the results page
+            await page.close()
             
-            leads = []
-            processed_places = set()
+            async def _bounded(rank: int, business_data: Dict) -> Tuple[int, Dict]:
+                async with self.sem:
+                    details = await self._fetch_detail(business_data.get('google_maps_url'))
+                business_data.update(details)
+                return rank, business_data
             
-            # Scroll and collect results
-            for i in range(max_results // 10):  # Approximate scroll cycles
-                await self._scroll_results()
-                await asyncio.sleep(1)
-                
-                # Extract business data
-                business_elements = await self.page.query_selector_all('[data-result-index]')
+            # Fetch details concurrently, one batch at a time so the number of
+            # contexts created per scrape stays bounded by detail_chunk_size
+            count = 0
+            for start in range(0, len(listings), self.detail_chunk_size):
+                batch = listings[start:start + self.detail_chunk_size]
                 
-                for element in business_elements:
-                    if len(leads) >= max_results:
-                        break
-                    
-                    lead_data = await self._extract_business_data(element)
-                    if lead_data and lead_data.get('name') not in processed_places:
-                        lead = Lead(**lead_data)
-                        leads.append(lead)
-                        processed_places.add(lead_data['name'])
-                        logger.info(f"Scraped: {lead.name}")
-                
-                if len(leads) >= max_results:
-                    break
+                for future in asyncio.as_completed([_bounded(start + i, b) for i, b in enumerate(batch)]):
+                    rank, business_data = await future
+                    # Fields are already normalized here, so skip validation
+                    lead = Lead.model_construct(**business_data)
+                    count += 1
+                    logger.info(f"Scraped: {lead.name}")
+                    yield rank, lead
             
-            logger.info(f"Scraping completed. Found {len(leads)} leads")
-            return leads
+            logger.info(f"Scraping completed. Found {count} leads")
             
         except Exception as e:
             logger.error(f"Scraping error: {str(e)}")
             raise e
         finally:
-            await self._close_browser()
+            await context.close()
     
-    async def _scroll_results(self):
-        """Scroll the results panel to load more businesses"""
+    async def _collect_place_urls(self, page: Page, query: str, location: str, max_results: int) -> List[Dict]:
+        """Scroll the results panel and collect listing data with place URLs"""
+        # Construct search URL
+        search_url = f"https://www.google.com/maps/search/{query}+{location}"
+        
+        # Navigate to Google Maps
+        await self._throttle(search_url)
+        await page.goto(search_url, wait_until='domcontentloaded')
+        
+        # Wait for results to load
+        await page.wait_for_selector('[data-result-index]', timeout=10000)
+        
+        listings = []
+        seen = set()
+        
+        # Scroll and collect results
+        for i in range(max_results // 10):  # Approximate scroll cycles
+            loaded_more = await self._scroll_results(page)
+            
+            # Extract business data
+            raw_listings = await page.evaluate(_EXTRACT_LISTINGS_JS)
+            
+            for listing in raw_listings:
+                if len(listings) >= max_results:
+                    break
+                
+                if not listing['name']:
+                    continue
+                
+                # Dedup before the detail pass so chains and re-rendered
+                # results don't trigger repeated detail fetches
+                business_data = self._to_business_data(listing)
+                key = self._listing_key(business_data)
+                if key in seen:
+                    continue
+                
+                seen.add(key)
+                listings.append(business_data)
+            
+            # Stop once scrolling no longer loads new results
+            if len(listings) >= max_results or not loaded_more:
+                break
+        
+        return listings
+    
+    async def _throttle(self, url: str):
+        """Wait for a request slot on the URL's host"""
+        await self.rate_limiter.for_key(urlparse(url).netloc).acquire()
+    
+    async def _scroll_results(self, page: Page) -> bool:
+        """Scroll the results panel and wait for more businesses to load"""
         try:
+            count_before = await page.locator('[data-result-index]').count()
+            
             # Find and scroll the results panel
-            await self.page.evaluate("""
+            await page.evaluate("""
                 const resultsPanel = document.querySelector('[data-value="Search results"]');
                 if (resultsPanel) {
                     resultsPanel.scrollTop = resultsPanel.scrollHeight;
                 }
             """)
-            await asyncio.sleep(1)
+            
+            # Return as soon as new results render instead of sleeping a fixed time
+            await page.wait_for_function(
+                "(before) => document.querySelectorAll('[data-result-index]').length > before",
+                arg=count_before,
+                timeout=3000
+            )
+            return True
+        except PlaywrightTimeoutError:
+            # No new results appeared, we've reached the end of the list
+            return False
         except Exception as e:
             logger.warning(f"Scroll error: {str(e)}")
+            return False
     
-    async def _extract_business_data(self, element) -> Optional[Dict]:
-        """Extract business data from a single business element"""
+    async def _wait_for_optional(self, page: Page, selector: str, timeout: int = 3000):
+        """Wait for a selector that not every place page has"""
         try:
-            # Extract business name
-            name_element = await element.query_selector('[data-value="Business name"]')
-            if not name_element:
-                return None
-            
-            name = await name_element.text_content()
-            if not name:
-                return None
-            
-            # Initialize business data
-            business_data = {
-                'name': name.strip(),
-                'address': None,
-                'phone': None,
-                'website': None,
-                'rating': None,
-                'reviews_count': None,
-                'category': None,
-                'google_maps_url': None,
-                'place_id': None,
-                'coordinates': None
-            }
-            
-            # Extract address
-            address_element = await element.query_selector('[data-value="Address"]')
-            if address_element:
-                address = await address_element.text_content()
-                business_data['address'] = address.strip() if address else None
-            
-            # Extract rating
-            rating_element = await element.query_selector('[data-value="Rating"]')
-            if rating_element:
-                rating_text = await rating_element.text_content()
-                if rating_text:
-                    rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                    if rating_match:
-                        business_data['rating'] = float(rating_match.group(1))
-            
-            # Extract reviews count
-            reviews_element = await element.query_selector('[data-value="Reviews"]')
-            if reviews_element:
-                reviews_text = await reviews_element.text_content()
-                if reviews_text:
-                    reviews_match = re.search(r'(\d+)', reviews_text.replace(',', ''))
-                    if reviews_match:
-                        business_data['reviews_count'] = int(reviews_match.group(1))
-            
-            # Extract category
-            category_element = await element.query_selector('[data-value="Category"]')
-            if category_element:
-                category = await category_element.text_content()
-                business_data['category'] = category.strip() if category else None
-            
-            # Try to get more details by clicking on the business
-            try:
-                await element.click()
-                await asyncio.sleep(1)
-                
-                # Extract phone number
-                phone_element = await self.page.query_selector('[data-value="Phone number"]')
-                if phone_element:
-                    phone = await phone_element.text_content()
-                    business_data['phone'] = phone.strip() if phone else None
-                
-                # Extract website
-                website_element = await self.page.query_selector('[data-value="Website"]')
-                if website_element:
-                    website_link = await website_element.query_selector('a')
-                    if website_link:
-                        website = await website_link.get_attribute('href')
-                        business_data['website'] = website
-                
-                # Extract Google Maps URL
-                current_url = self.page.url
-                if 'place/' in current_url:
-                    business_data['google_maps_url'] = current_url
-                    
-                    # Extract Place ID from URL
-                    place_id_match = re.search(r'place/([^/]+)', current_url)
-                    if place_id_match:
-                        business_data['place_id'] = place_id_match.group(1)
-                
-                # Go back to results
-                await self.page.go_back()
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.warning(f"Error extracting detailed info for {name}: {str(e)}")
+            await page.wait_for_selector(selector, state='attached', timeout=timeout)
+        except PlaywrightTimeoutError:
+            pass
+    
+    def _listing_key(self, business_data: Dict):
+        """Identify a listing by Maps feature ID, place ID or href, never by name alone"""
+        url = business_data['google_maps_url']
+        if url:
+            # Nearly every place href carries the feature ID, so prefer it for a stable key
+            feature_id_match = _FEATURE_ID_RE.search(url)
+            if feature_id_match:
+                return feature_id_match.group(1)
+        
+        if business_data['place_id']:
+            return business_data['place_id']
+        
+        if url:
+            # Query parameters vary between renders of the same listing
+            return url.split('?', 1)[0]
+        
+        return (business_data['name'], business_data['address'])
+    
+    def _to_business_data(self, listing: Dict) -> Dict:
+        """Build business data from a listing extracted in-page"""
+        place_id = None
+        if listing.get('google_maps_url'):
+            place_id_match = _PLACE_ID_RE.search(listing['google_maps_url'])
+            if place_id_match:
+                place_id = place_id_match.group(1)
+        
+        return {
+            'name': listing['name'],
+            'address': listing.get('address'),
+            'phone': None,
+            'website': None,
+            'rating': listing.get('rating'),
+            'reviews_count': listing.get('reviews_count'),
+            'category': listing.get('category'),
+            'google_maps_url': listing.get('google_maps_url'),
+            'place_id': place_id,
+            'coordinates': None
+        }
+    
+    async def _fetch_detail(self, url: Optional[str]) -> Dict:
+        """Open a place page in its own browser context and extract contact details"""
+        details = {}
+        if not url:
+            return details
+        
+        context = await self.browser.new_context(user_agent=USER_AGENT)
+        try:
+            page = await context.new_page()
+            await self._throttle(url)
+            await page.goto(url, wait_until='domcontentloaded')
+            await self._wait_for_optional(page, '[data-value="Phone number"], [data-value="Website"]')
+            
+            # Extract phone number
+            phone_element = await page.query_selector('[data-value="Phone number"]')
+            if phone_element:
+                phone = await phone_element.text_content()
+                details['phone'] = phone.strip() if phone else None
             
-            return business_data
+            # Extract website
+            website_element = await page.query_selector('[data-value="Website"]')
+            if website_element:
+                website_link = await website_element.query_selector('a')
+                if website_link:
+                    details['website'] = await website_link.get_attribute('href')
+            
+            # Extract Google Maps URL
+            current_url = page.url
+            if 'place/' in current_url:
+                details['google_maps_url'] = current_url
+                
+                # Extract Place ID from URL
+                place_id_match = _PLACE_ID_RE.search(current_url)
+                if place_id_match:
+                    details['place_id'] = place_id_match.group(1)
             
         except Exception as e:
-            logger.error(f"Error extracting business data: {str(e)}")
-            return None
+            logger.warning(f"Error extracting detailed info for {url}: {str(e)}")
+        finally:
+            await context.close()
+        
+        return details
     
     async def get_business_details(self, place_id: str) -> Optional[Dict]:
         """Get detailed information for a specific business"""
         await self._init_browser()
         
+        context = await self.browser.new_context(user_agent=USER_AGENT)
         try:
             # Navigate to specific place
-            place_url = f"https://www.google.com/maps/place/{place_id}"
-            await self.page.goto(place_url, wait_until='networkidle')
-            await asyncio.sleep(2)
+            page = await context.new_page()
+            place_url = f"https://www.google.com/maps/place/?q=place_id:{place_id}"
+            await self._throttle(place_url)
+            await page.goto(place_url, wait_until='domcontentloaded')
+            await self._wait_for_optional(page, '[data-value="Hours"]')
             
             # Extract detailed information
             details = {}
             
             # Extract hours
-            hours_element = await self.page.query_selector('[data-value="Hours"]')
+            hours_element = await page.query_selector('[data-value="Hours"]')
             if hours_element:
                 hours_text = await hours_element.text_content()
                 details['hours'] = hours_text.strip() if hours_text else None
@@ -231,9 +339,4 @@ class GoogleMapsScraper:
             logger.error(f"Error getting business details: {str(e)}")
             return None
         finally:
-            await self._close_browser()
-    
-    def __del__(self):
-        """Cleanup on destruction"""
-        if self.browser:
-            asyncio.create_task(self._close_browser())
\ No newline at end of file
+            await context.close()
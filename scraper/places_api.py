@@ -0,0 +1,169 @@
+import asyncio
+import os
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+import httpx
+from models.schemas import Lead
+from utils.rate_limiter import RateLimiter
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PLACES_API_URL = "https://places.googleapis.com"
+
+# Text Search only needs IDs; everything else comes from Place Details
+SEARCH_FIELD_MASK = "places.id,nextPageToken"
+DETAILS_FIELD_MASK = ",".join([
+    'id',
+    'displayName',
+    'formattedAddress',
+    'internationalPhoneNumber',
+    'websiteUri',
+    'rating',
+    'userRatingCount',
+    'primaryTypeDisplayName',
+    'googleMapsUri',
+    'location'
+])
+
+# Text Search returns at most 20 places per page
+MAX_PAGE_SIZE = 20
+
+class PlacesAPIScraper:
+    """
+    Google Maps lead source backed by the Places API instead of a headless browser
+    """
+    
+    def __init__(self, api_key: Optional[str] = None, requests_per_second: float = 10.0):
+        self.api_key = api_key or os.getenv("GOOGLE_PLACES_API_KEY")
+        self.client: Optional[httpx.AsyncClient] = None
+        
+        # All requests go to a single host, so one bucket covers them
+        self.rate_limiter = RateLimiter(requests_per_second)
+    
+    async def start(self):
+        """Create the shared HTTP client"""
+        if not self.client:
+            self.client = httpx.AsyncClient(
+                base_url=PLACES_API_URL,
+                headers={"X-Goog-Api-Key": self.api_key},
+                http2=True,
+                limits=httpx.Limits(max_connections=20),
+                timeout=10.0
+            )
+    
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def scrape_businesses(self, query: str, location: str, max_results: int = 50) -> List[Lead]:
+        """
+        Search Google Maps places, returned in Text Search ranking order
+        """
+        ranked = [pair async for pair in self.iter_scrape(query, location, max_results)]
+        ranked.sort(key=lambda pair: pair[0])
+        return [lead for _, lead in ranked]
+    
+    async def iter_scrape(self, query: str, location: str, max_results: int = 50) -> AsyncIterator[Tuple[int, Lead]]:
+        """
+        Search Google Maps places, yielding (rank, lead) pairs as soon as details arrive
+        """
+        await self.start()
+        
+        try:
+            logger.info(f"Starting Places API search for: {query} in {location}")
+            
+            place_ids = await self._search_place_ids(query, location, max_results)
+            
+            # Fetch details for every place concurrently
+            async def _ranked(rank: int, place_id: str) -> Tuple[int, Optional[Dict]]:
+                return rank, await self._get_place(place_id)
+            
+            count = 0
+            for future in asyncio.as_completed([_ranked(i, place_id) for i, place_id in enumerate(place_ids)]):
+                rank, place = await future
+                if not place:
+                    continue
+                # Fields are already normalized here, so skip validation
+                lead = Lead.model_construct(**self._to_business_data(place))
+                count += 1
+                logger.info(f"Scraped: {lead.name}")
+                yield rank, lead
+            
+            logger.info(f"Scraping completed. Found {count} leads")
+        
+        except Exception as e:
+            logger.error(f"Scraping error: {str(e)}")
+            raise e
+    
+    async def _search_place_ids(self, query: str, location: str, max_results: int) -> List[str]:
+        """Run a paginated Text Search and collect place IDs"""
+        place_ids = []
+        seen = set()
+        body = {
+            'textQuery': f"{query} in {location}",
+            'pageSize': min(max_results, MAX_PAGE_SIZE)
+        }
+        
+        while len(place_ids) < max_results:
+            await self.rate_limiter.acquire()
+            response = await self.client.post(
+                "/v1/places:searchText",
+                json=body,
+                headers={"X-Goog-FieldMask": SEARCH_FIELD_MASK}
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            for place in data.get('places', []):
+                if place['id'] not in seen:
+                    seen.add(place['id'])
+                    place_ids.append(place['id'])
+            
+            # Follow pagination until we have enough results
+            page_token = data.get('nextPageToken')
+            if not page_token:
+                break
+            body['pageToken'] = page_token
+        
+        return place_ids[:max_results]
+    
+    async def _get_place(self, place_id: str) -> Optional[Dict]:
+        """Fetch Place Details for a single place"""
+        try:
+            await self.rate_limiter.acquire()
+            response = await self.client.get(
+                f"/v1/places/{place_id}",
+                headers={"X-Goog-FieldMask": DETAILS_FIELD_MASK}
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.warning(f"Error fetching details for {place_id}: {str(e)}")
+            return None
+    
+    def _to_business_data(self, place: Dict) -> Dict:
+        """Map a Places API place to Lead fields"""
+        location = place.get('location')
+        
+        return {
+            'name': (place.get('displayName') or {}).get('text', ''),
+            'address': place.get('formattedAddress'),
+            'phone': place.get('internationalPhoneNumber'),
+            'website': place.get('websiteUri'),
+            'rating': place.get('rating'),
+            'reviews_count': place.get('userRatingCount'),
+            'category': (place.get('primaryTypeDisplayName') or {}).get('text'),
+            'google_maps_url': place.get('googleMapsUri'),
+            'place_id': place.get('id'),
+            'coordinates': {'lat': location['latitude'], 'lng': location['longitude']} if location else None
+        }
@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import os
+from typing import List, Optional, Protocol, Tuple
+from cachetools import TTLCache
+from pydantic import TypeAdapter
+import redis.asyncio as redis
+from models.schemas import Lead
+
+_LEADS_ADAPTER = TypeAdapter(List[Lead])
+
+def _compute_etag(data: bytes) -> str:
+    """Hash serialized leads into a short validator for HTTP caching"""
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+class LeadStore(Protocol):
+    """
+    Storage backend for scrape sessions
+    """
+    
+    async def put(self, scrape_id: str, leads: List[Lead]) -> None: ...
+    
+    async def get(self, scrape_id: str) -> Optional[List[Lead]]: ...
+    
+    async def get_with_etag(self, scrape_id: str) -> Optional[Tuple[List[Lead], str]]: ...
+    
+    async def delete(self, scrape_id: str) -> bool: ...
+    
+    async def close(self) -> None: ...
+
+class MemoryLeadStore:
+    """
+    Per-process store; least recently used sessions are evicted first and entries expire after ttl
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: int = 3600):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # cachetools is not thread-safe
+        self.lock = asyncio.Lock()
+    
+    async def put(self, scrape_id: str, leads: List[Lead]) -> None:
+        # Compute the ETag once per write so reads never re-serialize
+        etag = _compute_etag(_LEADS_ADAPTER.dump_json(leads))
+        async with self.lock:
+            self.cache[scrape_id] = (leads, etag)
+    
+    async def get(self, scrape_id: str) -> Optional[List[Lead]]:
+        entry = await self.get_with_etag(scrape_id)
+        return entry[0] if entry else None
+    
+    async def get_with_etag(self, scrape_id: str) -> Optional[Tuple[List[Lead], str]]:
+        async with self.lock:
+            return self.cache.get(scrape_id)
+    
+    async def delete(self, scrape_id: str) -> bool:
+        async with self.lock:
+            return self.cache.pop(scrape_id, None) is not None
+    
+    async def close(self) -> None:
+        pass
+
+class RedisLeadStore:
+    """
+    Redis-backed store shared by every worker; entries expire after ttl
+    """
+    
+    def __init__(self, url: str, ttl: int = 3600):
+        self.redis = redis.from_url(url)
+        self.ttl = ttl
+    
+    def _key(self, scrape_id: str) -> str:
+        return f"leads:{scrape_id}"
+    
+    async def put(self, scrape_id: str, leads: List[Lead]) -> None:
+        await self.redis.setex(self._key(scrape_id), self.ttl, _LEADS_ADAPTER.dump_json(leads))
+    
+    async def get(self, scrape_id: str) -> Optional[List[Lead]]:
+        data = await self.redis.get(self._key(scrape_id))
+        if data is None:
+            return None
+        return _LEADS_ADAPTER.validate_json(data)
+    
+    async def get_with_etag(self, scrape_id: str) -> Optional[Tuple[List[Lead], str]]:
+        data = await self.redis.get(self._key(scrape_id))
+        if data is None:
+            return None
+        return _LEADS_ADAPTER.validate_json(data), _compute_etag(data)
+    
+    async def delete(self, scrape_id: str) -> bool:
+        return await self.redis.delete(self._key(scrape_id)) > 0
+    
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+def create_lead_store() -> LeadStore:
+    """
+    Pick the store backend from environment configuration
+    """
+    ttl = int(os.getenv("LEADS_CACHE_TTL", 3600))
+    
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        return RedisLeadStore(redis_url, ttl=ttl)
+    
+    return MemoryLeadStore(maxsize=int(os.getenv("LEADS_CACHE_MAX", 1024)), ttl=ttl)
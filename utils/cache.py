@@ -0,0 +1,46 @@
+import hashlib
+from typing import Any, List, Optional
+from diskcache import Cache
+from models.schemas import Lead
+
+def cache_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from request parameters
+    """
+    raw = "|".join(str(part) for part in parts)
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+class ResultCache:
+    """
+    Disk-backed TTL cache for scrape and enrichment results, shared across restarts
+    """
+    
+    def __init__(self, directory: str = ".cache", ttl: int = 3600, size_limit: int = 2 ** 30):
+        # Once size_limit is reached, the least frequently hit entries are evicted first
+        self.cache = Cache(directory, size_limit=size_limit, eviction_policy='least-frequently-used')
+        self.ttl = ttl
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value"""
+        return self.cache.get(key, default)
+    
+    def set(self, key: str, value: Any):
+        """Cache a value until the TTL expires"""
+        self.cache.set(key, value, expire=self.ttl)
+    
+    def get_leads(self, key: str) -> Optional[List[Lead]]:
+        """Get cached leads, or None on a miss"""
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        return [Lead.model_construct(**lead) for lead in data]
+    
+    def set_leads(self, key: str, leads: List[Lead], min_count: int = 1):
+        """Cache leads, skipping results too small to be worth keeping"""
+        # Empty or tiny results usually mean the scrape failed or was blocked
+        if len(leads) < min_count:
+            return
+        self.set(key, [lead.model_dump() for lead in leads])
+    
+    def close(self):
+        self.cache.close()
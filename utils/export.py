@@ -1,15 +1,248 @@
 import csv
 import json
+import multiprocessing
 import os
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
 import re
+import time
 import logging
 from models.schemas import Lead
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import xlsxwriter
+except ImportError:  # Excel export falls back to CSV
+    xlsxwriter = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Large write buffer so exports issue few write syscalls
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Below this many leads a sharded export is written as a single CSV instead
+SHARD_MIN_LEADS = 100_000
+
+# Validation patterns, compiled once instead of per lead
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_STRIP_RE = re.compile(r'[^\d+]')
+
+# CSV headers shared by file and streaming exports
+CSV_HEADERS = [
+    'Name',
+    'Address',
+    'Phone',
+    'Email',
+    'Website',
+    'Category',
+    'Rating',
+    'Reviews Count',
+    'Google Maps URL',
+    'Place ID',
+    'Coordinates'
+]
+
+def _csv_row(lead: Lead) -> List:
+    """Build a CSV row for a single lead"""
+    # Format coordinates
+    c = lead.coordinates
+    coords = f"{c.get('lat', '')},{c.get('lng', '')}" if c else ""
+    
+    return [
+        lead.name or "",
+        lead.address or "",
+        lead.phone or "",
+        lead.email or "",
+        lead.website or "",
+        lead.category or "",
+        lead.rating or "",
+        lead.reviews_count or "",
+        lead.google_maps_url or "",
+        lead.place_id or "",
+        coords
+    ]
+
+def _json_dumps(obj) -> bytes:
+    """Encode an object as compact UTF-8 JSON"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _iso(timestamp: float) -> str:
+    """Format a file timestamp as local ISO 8601 without building a datetime"""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(timestamp))
+
+def _csv_rows(leads: Iterable[Lead]) -> Iterator[List]:
+    """Yield CSV rows for leads"""
+    for lead in leads:
+        yield _csv_row(lead)
+
+def _lead_issues(lead: Lead, _email_match=_EMAIL_RE.match, _phone_sub=_PHONE_STRIP_RE.sub) -> List[str]:
+    """Run the data quality checks for a single lead"""
+    # The regex methods are bound as defaults so each call reads them as fast locals
+    lead_issues = []
+    
+    # Check required fields
+    if not lead.name:
+        lead_issues.append("Missing name")
+    
+    # Validate email format
+    if lead.email:
+        if not _email_match(lead.email):
+            lead_issues.append("Invalid email format")
+    
+    # Validate phone format (basic)
+    if lead.phone:
+        phone_clean = _phone_sub('', lead.phone)
+        if len(phone_clean) < 10:
+            lead_issues.append("Phone number too short")
+    
+    # Validate website URL
+    website = lead.website
+    if website:
+        if not (website.startswith(('http://', 'https://')) or '.' in website):
+            lead_issues.append("Invalid website URL")
+    
+    return lead_issues
+
+class _LeadStats:
+    """
+    Running summary counters and validation issues, fed one lead at a time
+    """
+    
+    def __init__(self):
+        self.total_leads = 0
+        self.leads_with_email = 0
+        self.leads_with_phone = 0
+        self.leads_with_website = 0
+        self.rating_sum = 0.0
+        self.rating_count = 0
+        self.categories = {}
+        self.checked_leads = 0
+        self.issues = []
+    
+    def check(self, index: int, lead: Lead):
+        """Run the data quality checks for a lead and record any issues"""
+        self.checked_leads += 1
+        lead_issues = _lead_issues(lead)
+        if lead_issues:
+            self.issues.append({
+                'lead_index': index,
+                'lead_name': lead.name,
+                'issues': lead_issues
+            })
+    
+    def tally(self, leads: Iterable[Lead], validate: bool = True) -> Iterator[Lead]:
+        """Count (and optionally check) each lead as it passes through to the consumer"""
+        # Counters stay in locals for the loop and are stored once it finishes
+        total_leads = leads_with_email = leads_with_phone = leads_with_website = 0
+        rating_sum = 0.0
+        rating_count = 0
+        categories = self.categories
+        check = self.check
+        
+        try:
+            for i, lead in enumerate(leads):
+                total_leads += 1
+                if lead.email:
+                    leads_with_email += 1
+                if lead.phone:
+                    leads_with_phone += 1
+                if lead.website:
+                    leads_with_website += 1
+                
+                rating = lead.rating
+                if rating is not None:
+                    rating_sum += rating
+                    rating_count += 1
+                
+                category = lead.category
+                if category:
+                    categories[category] = categories.get(category, 0) + 1
+                
+                if validate:
+                    check(i, lead)
+                
+                yield lead
+        finally:
+            self.total_leads += total_leads
+            self.leads_with_email += leads_with_email
+            self.leads_with_phone += leads_with_phone
+            self.leads_with_website += leads_with_website
+            self.rating_sum += rating_sum
+            self.rating_count += rating_count
+    
+    def summary(self) -> Dict:
+        """Build the export summary from the counters"""
+        total_leads = self.total_leads
+        
+        # Calculate average rating
+        avg_rating = self.rating_sum / self.rating_count if self.rating_count else 0
+        
+        return {
+            'total_leads': total_leads,
+            'leads_with_email': self.leads_with_email,
+            'leads_with_phone': self.leads_with_phone,
+            'leads_with_website': self.leads_with_website,
+            'email_coverage': round((self.leads_with_email / total_leads) * 100, 2) if total_leads > 0 else 0,
+            'phone_coverage': round((self.leads_with_phone / total_leads) * 100, 2) if total_leads > 0 else 0,
+            'website_coverage': round((self.leads_with_website / total_leads) * 100, 2) if total_leads > 0 else 0,
+            'average_rating': round(avg_rating, 2),
+            'categories': self.categories
+        }
+    
+    def validation(self) -> Dict:
+        """Build the validation report from the recorded issues"""
+        total_leads = self.checked_leads
+        issues = self.issues
+        return {
+            'total_leads': total_leads,
+            'leads_with_issues': len(issues),
+            'issues': issues,
+            'data_quality_score': round(((total_leads - len(issues)) / total_leads) * 100, 2) if total_leads else 0
+        }
+
+def _write_csv(leads: Iterable[Lead], csvfile) -> None:
+    """Write the header and one row per lead to an open text file"""
+    # Every row is formatted in the C csv writer
+    writer = csv.writer(csvfile)
+    writer.writerow(CSV_HEADERS)
+    writer.writerows(_csv_rows(leads))
+
+def _write_csv_file(leads: Iterable[Lead], filepath: str) -> str:
+    """Write leads to a CSV file"""
+    with open(filepath, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as csvfile:
+        _write_csv(leads, csvfile)
+    return filepath
+
+# Leads for the sharded export in progress. Workers are forked after this is set,
+# so they inherit the list and only receive index ranges instead of pickled leads
+_SHARD_LEADS: List[Lead] = []
+_SHARD_LOCK = threading.Lock()
+
+def _write_shard(start: int, stop: int, filepath: str) -> str:
+    """Write one slice of the inherited leads to a CSV file (runs in a forked worker)"""
+    return _write_csv_file(_SHARD_LEADS[start:stop], filepath)
+
+class _LineWriter:
+    """File-like target whose write() hands the formatted line straight back"""
+    
+    def write(self, line: str) -> str:
+        return line
+
 class ExportManager:
     """
     Manager for exporting leads to various formats
@@ -24,62 +257,28 @@ class ExportManager:
         if not os.path.exists(self.export_dir):
             os.makedirs(self.export_dir)
     
+    def _csv_path(self, filename: Optional[str]) -> str:
+        """Resolve the export path for a CSV file"""
+        # Generate filename if not provided
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"leads_{timestamp}.csv"
+        
+        # Ensure .csv extension
+        if not filename.endswith('.csv'):
+            filename += '.csv'
+        
+        return os.path.join(self.export_dir, filename)
+    
     def export_to_csv(self, leads: List[Lead], filename: Optional[str] = None) -> str:
         """
         Export leads to CSV file
         """
         try:
-            # Generate filename if not provided
-            if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"leads_{timestamp}.csv"
-            
-            # Ensure .csv extension
-            if not filename.endswith('.csv'):
-                filename += '.csv'
-            
-            filepath = os.path.join(self.export_dir, filename)
-            
-            # Define CSV headers
-            headers = [
-                'Name',
-                'Address',
-                'Phone',
-                'Email',
-                'Website',
-                'Category',
-                'Rating',
-                'Reviews Count',
-                'Google Maps URL',
-                'Place ID',
-                'Coordinates'
-            ]
+            filepath = self._csv_path(filename)
             
             # Write CSV
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(headers)
-                
-                for lead in leads:
-                    # Format coordinates
-                    coords = ""
-                    if lead.coordinates:
-                        coords = f"{lead.coordinates.get('lat', '')},{lead.coordinates.get('lng', '')}"
-                    
-                    row = [
-                        lead.name or "",
-                        lead.address or "",
-                        lead.phone or "",
-                        lead.email or "",
-                        lead.website or "",
-                        lead.category or "",
-                        lead.rating or "",
-                        lead.reviews_count or "",
-                        lead.google_maps_url or "",
-                        lead.place_id or "",
-                        coords
-                    ]
-                    writer.writerow(row)
+            _write_csv_file(leads, filepath)
             
             logger.info(f"Exported {len(leads)} leads to {filepath}")
             return filepath
@@ -88,6 +287,53 @@ class ExportManager:
             logger.error(f"CSV export error: {str(e)}")
             raise e
     
+    def export_to_csv_sharded(self, leads: List[Lead], filename: Optional[str] = None) -> List[str]:
+        """
+        Export a very large lead list to one CSV file per core, written in parallel processes
+        Each shard has its own header row; small lists, single-core hosts and platforms
+        without fork get a single export_to_csv file instead
+        """
+        cpu_count = os.cpu_count() or 1
+        if (len(leads) <= SHARD_MIN_LEADS or cpu_count <= 1
+                or 'fork' not in multiprocessing.get_all_start_methods()):
+            return [self.export_to_csv(leads, filename)]
+        
+        try:
+            base = self._csv_path(filename)[:-len('.csv')]
+            shard_size = -(-len(leads) // cpu_count)
+            starts = list(range(0, len(leads), shard_size))
+            stops = [start + shard_size for start in starts]
+            paths = [f"{base}_part{i + 1:03d}.csv" for i in range(len(starts))]
+            
+            global _SHARD_LEADS
+            with _SHARD_LOCK:
+                _SHARD_LEADS = leads
+                try:
+                    with ProcessPoolExecutor(max_workers=len(starts), mp_context=multiprocessing.get_context('fork')) as executor:
+                        filepaths = list(executor.map(_write_shard, starts, stops, paths))
+                finally:
+                    _SHARD_LEADS = []
+            
+            logger.info(f"Exported {len(leads)} leads to {len(filepaths)} CSV shards in {self.export_dir}")
+            return filepaths
+            
+        except Exception as e:
+            logger.error(f"Sharded CSV export error: {str(e)}")
+            raise e
+    
+    def iter_csv(self, leads: List[Lead]) -> Iterator[str]:
+        """
+        Yield leads as CSV text one row at a time for streaming responses
+        """
+        # writerow returns whatever write() returns, so this formats a full CSV line in
+        # the C csv module without a StringIO round trip. Each call gets its own writer
+        # since StreamingResponse iterates concurrent exports on different threads
+        csv_line = csv.writer(_LineWriter()).writerow
+        
+        yield csv_line(CSV_HEADERS)
+        for row in _csv_rows(leads):
+            yield csv_line(row)
+    
     def export_to_json(self, leads: List[Lead], filename: Optional[str] = None) -> str:
         """
         Export leads to JSON file
@@ -104,27 +350,16 @@ class ExportManager:
             
             filepath = os.path.join(self.export_dir, filename)
             
-            # Convert leads to dictionaries
-            leads_data = []
-            for lead in leads:
-                lead_dict = {
-                    'name': lead.name,
-                    'address': lead.address,
-                    'phone': lead.phone,
-                    'email': lead.email,
-                    'website': lead.website,
-                    'category': lead.category,
-                    'rating': lead.rating,
-                    'reviews_count': lead.reviews_count,
-                    'google_maps_url': lead.google_maps_url,
-                    'place_id': lead.place_id,
-                    'coordinates': lead.coordinates
-                }
-                leads_data.append(lead_dict)
-            
-            # Write JSON
-            with open(filepath, 'w', encoding='utf-8') as jsonfile:
-                json.dump(leads_data, jsonfile, indent=2, ensure_ascii=False)
+            # Write JSON one lead per line instead of building the whole list first;
+            # model_dump builds each dict in pydantic-core rather than field by field
+            with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as jsonfile:
+                jsonfile.write(b'[')
+                separator = b'\n  '
+                for lead in leads:
+                    jsonfile.write(separator)
+                    jsonfile.write(_json_dumps(lead.model_dump()))
+                    separator = b',\n  '
+                jsonfile.write(b'\n]\n' if leads else b']\n')
             
             logger.info(f"Exported {len(leads)} leads to {filepath}")
             return filepath
@@ -133,6 +368,70 @@ class ExportManager:
             logger.error(f"JSON export error: {str(e)}")
             raise e
     
+    def export_to_parquet(self, leads: List[Lead], filename: Optional[str] = None) -> str:
+        """
+        Export leads to a columnar Parquet file (requires pyarrow, falls back to CSV)
+        """
+        try:
+            if not pa:
+                logger.warning("pyarrow is not installed, exporting CSV instead of Parquet")
+                csv_filename = filename.replace('.parquet', '.csv') if filename else None
+                return self.export_to_csv(leads, csv_filename)
+            
+            # Generate filename if not provided
+            if not filename:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"leads_{timestamp}.parquet"
+            
+            # Ensure .parquet extension
+            if not filename.endswith('.parquet'):
+                filename += '.parquet'
+            
+            filepath = os.path.join(self.export_dir, filename)
+            
+            # Build every column in a single pass
+            names, addresses, phones, emails, websites, categories = [], [], [], [], [], []
+            ratings, reviews_counts, maps_urls, place_ids, lats, lngs = [], [], [], [], [], []
+            for lead in leads:
+                names.append(lead.name)
+                addresses.append(lead.address)
+                phones.append(lead.phone)
+                emails.append(lead.email)
+                websites.append(lead.website)
+                categories.append(lead.category)
+                ratings.append(lead.rating)
+                reviews_counts.append(lead.reviews_count)
+                maps_urls.append(lead.google_maps_url)
+                place_ids.append(lead.place_id)
+                coords = lead.coordinates or {}
+                lats.append(coords.get('lat'))
+                lngs.append(coords.get('lng'))
+            
+            table = pa.table({
+                'name': pa.array(names, type=pa.string()),
+                'address': pa.array(addresses, type=pa.string()),
+                'phone': pa.array(phones, type=pa.string()),
+                'email': pa.array(emails, type=pa.string()),
+                'website': pa.array(websites, type=pa.string()),
+                'category': pa.array(categories, type=pa.string()),
+                'rating': pa.array(ratings, type=pa.float32()),
+                'reviews_count': pa.array(reviews_counts, type=pa.int32()),
+                'google_maps_url': pa.array(maps_urls, type=pa.string()),
+                'place_id': pa.array(place_ids, type=pa.string()),
+                'lat': pa.array(lats, type=pa.float64()),
+                'lng': pa.array(lngs, type=pa.float64())
+            })
+            
+            # Write Parquet
+            pq.write_table(table, filepath, compression='zstd')
+            
+            logger.info(f"Exported {len(leads)} leads to {filepath}")
+            return filepath
+            
+        except Exception as e:
+            logger.error(f"Parquet export error: {str(e)}")
+            raise e
+    
     def export_to_sheets(self, leads: List[Lead], sheets_url: str) -> bool:
         """
         Export leads to Google Sheets (simplified implementation)
@@ -149,7 +448,7 @@ class ExportManager:
             # Create CSV for manual import
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             csv_filename = f"leads_for_sheets_{timestamp}.csv"
-            csv_path = self.export_to_csv(leads, csv_filename)
+            csv_path = _write_csv_file(leads, os.path.join(self.export_dir, csv_filename))
             
             logger.info(f"CSV created at {csv_path}")
             logger.info("To import to Google Sheets:")
@@ -165,12 +464,9 @@ class ExportManager:
     
     def export_to_excel(self, leads: List[Lead], filename: Optional[str] = None) -> str:
         """
-        Export leads to Excel file (basic implementation without pandas)
+        Export leads to an Excel file, streamed with xlsxwriter's constant memory mode
         """
         try:
-            # For basic Excel export without external dependencies
-            # We'll create a CSV that can be opened in Excel
-            
             if not filename:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 filename = f"leads_{timestamp}.xlsx"
@@ -179,14 +475,30 @@ class ExportManager:
             if not filename.endswith('.xlsx'):
                 filename += '.xlsx'
             
-            # Create CSV version (Excel can open CSV files)
-            csv_filename = filename.replace('.xlsx', '.csv')
-            csv_path = self.export_to_csv(leads, csv_filename)
+            if not xlsxwriter:
+                # Without xlsxwriter, create a CSV version (Excel can open CSV files)
+                csv_filename = filename.replace('.xlsx', '.csv')
+                csv_path = self.export_to_csv(leads, csv_filename)
+                
+                logger.info(f"Excel-compatible CSV created at {csv_path}")
+                logger.info("This file can be opened in Excel and saved as .xlsx")
+                
+                return csv_path
+            
+            filepath = os.path.join(self.export_dir, filename)
             
-            logger.info(f"Excel-compatible CSV created at {csv_path}")
-            logger.info("This file can be opened in Excel and saved as .xlsx")
+            # constant_memory flushes each row to disk as soon as the next one starts
+            workbook = xlsxwriter.Workbook(filepath, {'constant_memory': True})
+            try:
+                worksheet = workbook.add_worksheet()
+                worksheet.write_row(0, 0, CSV_HEADERS)
+                for row_index, row in enumerate(_csv_rows(leads), 1):
+                    worksheet.write_row(row_index, 0, row)
+            finally:
+                workbook.close()
             
-            return csv_path
+            logger.info(f"Exported {len(leads)} leads to {filepath}")
+            return filepath
             
         except Exception as e:
             logger.error(f"Excel export error: {str(e)}")
@@ -197,32 +509,13 @@ class ExportManager:
         Get summary statistics for the leads
         """
         try:
-            total_leads = len(leads)
-            leads_with_email = len([l for l in leads if l.email])
-            leads_with_phone = len([l for l in leads if l.phone])
-            leads_with_website = len([l for l in leads if l.website])
+            stats = _LeadStats()
             
-            # Calculate average rating
-            ratings = [l.rating for l in leads if l.rating is not None]
-            avg_rating = sum(ratings) / len(ratings) if ratings else 0
+            # Gather every statistic in a single pass over the leads
+            for _ in stats.tally(leads, validate=False):
+                pass
             
-            # Get categories
-            categories = {}
-            for lead in leads:
-                if lead.category:
-                    categories[lead.category] = categories.get(lead.category, 0) + 1
-            
-            return {
-                'total_leads': total_leads,
-                'leads_with_email': leads_with_email,
-                'leads_with_phone': leads_with_phone,
-                'leads_with_website': leads_with_website,
-                'email_coverage': round((leads_with_email / total_leads) * 100, 2) if total_leads > 0 else 0,
-                'phone_coverage': round((leads_with_phone / total_leads) * 100, 2) if total_leads > 0 else 0,
-                'website_coverage': round((leads_with_website / total_leads) * 100, 2) if total_leads > 0 else 0,
-                'average_rating': round(avg_rating, 2),
-                'categories': categories
-            }
+            return stats.summary()
             
         except Exception as e:
             logger.error(f"Summary generation error: {str(e)}")
@@ -233,50 +526,43 @@ class ExportManager:
         Validate leads data quality
         """
         try:
-            issues = []
+            stats = _LeadStats()
+            
+            # Bind the hot lookup to a local once for the whole loop
+            check = stats.check
             
             for i, lead in enumerate(leads):
-                lead_issues = []
-                
-                # Check required fields
-                if not lead.name:
-                    lead_issues.append("Missing name")
-                
-                # Validate email format
-                if lead.email:
-                    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}
-                    if not re.match(email_pattern, lead.email):
-                        lead_issues.append("Invalid email format")
-                
-                # Validate phone format (basic)
-                if lead.phone:
-                    phone_clean = re.sub(r'[^\d+]', '', lead.phone)
-                    if len(phone_clean) < 10:
-                        lead_issues.append("Phone number too short")
-                
-                # Validate website URL
-                if lead.website:
-                    if not (lead.website.startswith('http://') or lead.website.startswith('https://') or '.' in lead.website):
-                        lead_issues.append("Invalid website URL")
-                
-                if lead_issues:
-                    issues.append({
-                        'lead_index': i,
-                        'lead_name': lead.name,
-                        'issues': lead_issues
-                    })
+                check(i, lead)
             
-            return {
-                'total_leads': len(leads),
-                'leads_with_issues': len(issues),
-                'issues': issues,
-                'data_quality_score': round(((len(leads) - len(issues)) / len(leads)) * 100, 2) if leads else 0
-            }
+            return stats.validation()
             
         except Exception as e:
             logger.error(f"Data validation error: {str(e)}")
             return {}
     
+    def export_with_stats(self, leads: List[Lead], filename: Optional[str] = None) -> Tuple[str, Dict, Dict]:
+        """
+        Export leads to CSV while computing the summary and validation report in the same pass
+        Returns (filepath, summary, validation)
+        """
+        try:
+            filepath = self._csv_path(filename)
+            
+            # The writer pulls each lead through the tally, so writing, counting and
+            # validating all happen in one loop over the leads
+            stats = _LeadStats()
+            _write_csv_file(stats.tally(leads), filepath)
+            
+            summary = stats.summary()
+            validation = stats.validation()
+            
+            logger.info(f"Exported {len(leads)} leads to {filepath}")
+            return filepath, summary, validation
+            
+        except Exception as e:
+            logger.error(f"CSV export error: {str(e)}")
+            raise e
+    
     def cleanup_old_exports(self, days_old: int = 7):
         """
         Clean up old export files
@@ -284,14 +570,17 @@ class ExportManager:
         try:
             cutoff_time = datetime.now().timestamp() - (days_old * 24 * 60 * 60)
             
-            for filename in os.listdir(self.export_dir):
-                filepath = os.path.join(self.export_dir, filename)
-                if os.path.isfile(filepath):
-                    file_time = os.path.getmtime(filepath)
-                    if file_time < cutoff_time:
-                        os.remove(filepath)
-                        logger.info(f"Deleted old export: {filename}")
-                        
+            # Collect expired files first, then delete them in one tight loop
+            with os.scandir(self.export_dir) as entries:
+                victims = [
+                    (entry.name, entry.path) for entry in entries
+                    if entry.is_file() and entry.stat().st_mtime < cutoff_time
+                ]
+            
+            for name, path in victims:
+                os.unlink(path)
+                logger.info(f"Deleted old export: {name}")
+            
         except Exception as e:
             logger.error(f"Cleanup error: {str(e)}")
     
@@ -302,15 +591,17 @@ class ExportManager:
         try:
             exports = []
             
-            for filename in os.listdir(self.export_dir):
-                filepath = os.path.join(self.export_dir, filename)
-                if os.path.isfile(filepath):
-                    stat = os.stat(filepath)
+            with os.scandir(self.export_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    
+                    stat = entry.stat()
                     exports.append({
-                        'filename': filename,
+                        'filename': entry.name,
                         'size': stat.st_size,
-                        'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                        'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
+                        'created': _iso(stat.st_ctime),
+                        'modified': _iso(stat.st_mtime)
                     })
             
             return sorted(exports, key=lambda x: x['modified'], reverse=True)
@@ -0,0 +1,46 @@
+import asyncio
+import hashlib
+from cachetools import TTLCache
+
+class RateLimiter:
+    """
+    Spaces out requests so they never exceed a fixed rate, even under asyncio.gather
+    """
+    
+    def __init__(self, rps: float):
+        self.interval = 1 / rps
+        self.lock = asyncio.Lock()
+        self.next = 0.0
+    
+    async def acquire(self):
+        """Wait for the next free request slot"""
+        async with self.lock:
+            now = asyncio.get_running_loop().time()
+            wait = max(0.0, self.next - now)
+            self.next = max(now, self.next) + self.interval
+        
+        # Sleep outside the lock so later callers can reserve their own slots
+        await asyncio.sleep(wait)
+
+class KeyedRateLimiter:
+    """
+    Keeps an independent RateLimiter per key (API key, host, ...)
+    """
+    
+    def __init__(self, rps: float, maxsize: int = 1024, idle_ttl: float = 600):
+        self.rps = rps
+        # Keys can come from callers (e.g. Hunter API keys), so bound the set of
+        # limiters; one idle for idle_ttl has no pending slots worth keeping
+        self.limiters = TTLCache(maxsize=maxsize, ttl=idle_ttl)
+    
+    def for_key(self, key: str) -> RateLimiter:
+        """Get or create the limiter for a key"""
+        # Only a digest is kept so secrets used as keys don't sit in memory
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        limiter = self.limiters.get(digest)
+        if limiter is None:
+            limiter = RateLimiter(self.rps)
+        
+        # Re-inserting restarts the TTL, so only idle limiters expire
+        self.limiters[digest] = limiter
+        return limiter